@@ -3,68 +3,253 @@
 from __future__ import annotations
 
 import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict
+from threading import Event
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
 from .config import Config
 from .utils import compute_file_hash, iter_files, should_exclude
 
+IN_FLIGHT_PER_WORKER = 4
+ZSTD_LEVEL = 3
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
 
 @dataclass(frozen=True)
 class BaselineRecord:
     """Immutable record of a file's trusted state."""
 
     path: str
-    hash: str
+    hash: bytes
     size: int
     mtime: float
+    mtime_ns: int = 0
+    inode: int = 0
+    ctime_ns: int = 0
+
+
+def iter_monitored_files(
+    config: Config, with_stat: bool = True
+) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+    """Yield ``(path, stat)`` for every configured file that is not excluded.
+
+    With ``with_stat=False`` the stat is skipped and ``None`` is yielded.
+    """
+
+    for root in config.paths:
+        for path, stat in iter_files(root, config.follow_symlinks, with_stat):
+            if not should_exclude(path, config.exclude_matcher):
+                yield path, stat
+
+
+def _hash_one(path: str, algorithm: str, logger) -> Optional[BaselineRecord]:
+    """Hash a single file, returning None if it cannot be read."""
+
+    try:
+        file_hash, stat = compute_file_hash(path, algorithm)
+    except OSError as exc:
+        logger.warning("Skipping %s: %s", path, exc)
+        return None
+    return BaselineRecord(
+        path=path,
+        hash=file_hash,
+        size=stat.st_size,
+        mtime=stat.st_mtime,
+        mtime_ns=stat.st_mtime_ns,
+        inode=stat.st_ino,
+        ctime_ns=stat.st_ctime_ns,
+    )
+
+
+def _unchanged_record(
+    path: str, stat: os.stat_result, previous: Dict[str, BaselineRecord]
+) -> Optional[BaselineRecord]:
+    """Return the previous record if size, mtime, ctime and inode still match.
+
+    ctime is part of the check because mtime can be reset with ``os.utime``
+    after tampering, while ctime cannot be set by unprivileged users.
+    """
+
+    record = previous.get(path)
+    if record is None:
+        return None
+    if (
+        record.size == stat.st_size
+        and record.mtime_ns == stat.st_mtime_ns
+        and record.inode == stat.st_ino
+        and record.ctime_ns == stat.st_ctime_ns
+    ):
+        return record
+    return None
+
+
+def hash_files(
+    files: Iterable[Tuple[str, Optional[os.stat_result]]],
+    config: Config,
+    logger,
+    previous: Optional[Dict[str, BaselineRecord]] = None,
+    stop_event: Optional[Event] = None,
+) -> Dict[str, BaselineRecord]:
+    """Hash files concurrently on a thread pool of ``config.workers`` threads.
+
+    Hashing releases the GIL, so reads and digests overlap across threads.
+    ``files`` yields ``(path, stat)`` pairs and is consumed lazily with at
+    most ``IN_FLIGHT_PER_WORKER`` pending reads per worker, so the directory
+    walk overlaps hashing and memory stays bounded on large trees.
+
+    When ``previous`` records are given, files whose size, mtime, ctime and
+    inode (from the walk's stat) are unchanged reuse the previous record
+    instead of being re-hashed. The walk's stat is only needed for that
+    check and may be None otherwise; new records take their metadata from
+    the ``fstat`` of the descriptor that was hashed.
+
+    Once ``stop_event`` is set no further files are submitted, queued reads
+    are cancelled and the partial result is returned after running reads
+    finish.
+    """
+
+    records: Dict[str, BaselineRecord] = {}
+    max_in_flight = config.workers * IN_FLIGHT_PER_WORKER
+
+    def collect(done: Iterable[Future]) -> None:
+        for future in done:
+            record = future.result()
+            if record is not None:
+                records[record.path] = record
+
+    with ThreadPoolExecutor(max_workers=config.workers) as executor:
+        pending = set()
+        for path, stat in files:
+            if stop_event is not None and stop_event.is_set():
+                for future in pending:
+                    future.cancel()
+                break
+            if previous is not None and stat is not None:
+                record = _unchanged_record(path, stat, previous)
+                if record is not None:
+                    records[record.path] = record
+                    continue
+            pending.add(executor.submit(_hash_one, path, config.hash_algorithm, logger))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(future for future in wait(pending).done if not future.cancelled())
+    return records
 
 
 def build_baseline(config: Config, logger) -> Dict[str, BaselineRecord]:
     """Walk configured paths and compute a baseline hash for each file."""
 
-    baseline: Dict[str, BaselineRecord] = {}
+    # No previous records to compare against, so the walk skips its stat and
+    # each file is stat'ed only once, by fstat while hashing.
+    return hash_files(iter_monitored_files(config, with_stat=False), config, logger)
 
-    for root in config.paths:
-        for path in iter_files(root, config.follow_symlinks):
-            if should_exclude(path, root, config.exclude_globs):
-                continue
-
-            try:
-                file_hash = compute_file_hash(path, config.hash_algorithm)
-                stat = path.stat()
-                record = BaselineRecord(
-                    path=str(path),
-                    hash=file_hash,
-                    size=stat.st_size,
-                    mtime=stat.st_mtime,
-                )
-                baseline[str(path)] = record
-            except OSError as exc:
-                logger.warning("Skipping %s: %s", path, exc)
 
-    return baseline
+def _binary_codecs():
+    """Import the optional msgpack/zstandard pair used for binary baselines."""
+
+    try:
+        import msgpack
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError(
+            "msgpack and zstandard are required for binary baselines. "
+            "Install with pip or use a .json baseline_file."
+        ) from exc
+    return msgpack, zstandard
 
 
-def save_baseline(records: Dict[str, BaselineRecord], destination: Path) -> None:
-    """Save baseline records to a JSON file."""
+def save_baseline(
+    records: Dict[str, BaselineRecord], destination: Path, hash_algorithm: str
+) -> None:
+    """Save baseline records and the algorithm that hashed them to disk.
+
+    A ``.json`` destination is written as readable JSON; any other name is
+    written as a zstd-compressed msgpack stream (a header map followed by one
+    row per record), which is smaller and much faster to load for large trees.
+    """
 
     destination.parent.mkdir(parents=True, exist_ok=True)
-    payload = {path: asdict(record) for path, record in records.items()}
-    destination.write_text(json.dumps(payload, indent=2, sort_keys=True))
 
+    if destination.suffix == ".json":
+        payload = {
+            "hash_algorithm": hash_algorithm,
+            "records": {
+                path: {**asdict(record), "hash": record.hash.hex()}
+                for path, record in records.items()
+            },
+        }
+        destination.write_text(json.dumps(payload, indent=2, sort_keys=True))
+        return
+
+    msgpack, zstandard = _binary_codecs()
+    # os.scandir returns undecodable filenames as surrogate escapes.
+    packer = msgpack.Packer(unicode_errors="surrogateescape")
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    with zstandard.open(destination, "wb", cctx=compressor) as handle:
+        handle.write(packer.pack({"hash_algorithm": hash_algorithm}))
+        for record in records.values():
+            handle.write(
+                packer.pack(
+                    (
+                        record.path,
+                        record.hash,
+                        record.size,
+                        record.mtime,
+                        record.mtime_ns,
+                        record.inode,
+                        record.ctime_ns,
+                    )
+                )
+            )
 
-def load_baseline(baseline_path: Path) -> Dict[str, BaselineRecord]:
-    """Load baseline records from disk."""
 
-    data = json.loads(baseline_path.read_text())
+def load_baseline(
+    baseline_path: Path,
+) -> Tuple[Optional[str], Dict[str, BaselineRecord]]:
+    """Load ``(hash_algorithm, records)`` from disk.
+
+    JSON or binary is detected by content. Baselines written before the
+    algorithm was recorded could use any algorithm, so their
+    ``hash_algorithm`` is None.
+    """
+
+    with baseline_path.open("rb") as handle:
+        magic = handle.read(len(ZSTD_MAGIC))
+
+    hash_algorithm: Optional[str] = None
     baseline: Dict[str, BaselineRecord] = {}
+
+    if magic == ZSTD_MAGIC:
+        msgpack, zstandard = _binary_codecs()
+        with zstandard.open(baseline_path, "rb") as handle:
+            for row in msgpack.Unpacker(
+                handle, use_list=False, unicode_errors="surrogateescape"
+            ):
+                if isinstance(row, dict):
+                    hash_algorithm = row["hash_algorithm"]
+                    continue
+                record = BaselineRecord(*row)
+                baseline[record.path] = record
+        return hash_algorithm, baseline
+
+    data = json.loads(baseline_path.read_text())
+    # Legacy JSON baselines are a bare {path: record} mapping; paths are
+    # absolute, so they cannot collide with the "records" key.
+    if isinstance(data.get("records"), dict):
+        hash_algorithm = data["hash_algorithm"]
+        data = data["records"]
     for path, record in data.items():
         baseline[path] = BaselineRecord(
             path=record["path"],
-            hash=record["hash"],
+            hash=bytes.fromhex(record["hash"]),
             size=record["size"],
             mtime=record["mtime"],
+            mtime_ns=record.get("mtime_ns", 0),
+            inode=record.get("inode", 0),
+            ctime_ns=record.get("ctime_ns", 0),
         )
-    return baseline
+    return hash_algorithm, baseline
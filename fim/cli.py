@@ -4,20 +4,29 @@ from __future__ import annotations
 
 import argparse
 import logging
+import signal
 import sys
-import time
 from pathlib import Path
+from queue import SimpleQueue
 from threading import Event, Thread
+from typing import Optional
 
 from .baseline import build_baseline, load_baseline, save_baseline
 from .config import load_config
 from .monitor import (
     Change,
-    build_event_change,
+    build_event_changes,
     compare_baseline,
+    drain_event_batch,
     snapshot,
 )
 from .reporting import report_changes
+from .utils import new_hasher
+
+MAX_EVENT_BATCH = 1024
+# Read-only inotify events; hashing a file produces these, so queueing them
+# would make every batch trigger another one.
+ACCESS_EVENT_TYPES = {"opened", "closed_no_write"}
 
 
 def setup_logging(log_path: Path) -> logging.Logger:
@@ -49,18 +58,56 @@ def run_baseline(config_path: Path) -> int:
     config = load_config(config_path)
     logger = setup_logging(config.log_file)
     baseline = build_baseline(config, logger)
-    save_baseline(baseline, config.baseline_file)
+    save_baseline(baseline, config.baseline_file, config.hash_algorithm)
     logger.info("Baseline saved to %s", config.baseline_file)
     return 0
 
 
+def check_baseline(
+    baseline_algorithm: Optional[str], baseline, config, logger
+) -> bool:
+    """Log an error if the baseline was hashed with a different algorithm."""
+
+    if baseline_algorithm is None:
+        # Legacy baselines do not record their algorithm; the digest size of
+        # one record is the best available check.
+        record = next(iter(baseline.values()), None)
+        digest_size = new_hasher(config.hash_algorithm).digest_size
+        if record is None or len(record.hash) == digest_size:
+            return True
+        logger.error(
+            "Baseline %s has %d-byte digests but hash_algorithm %s produces "
+            "%d-byte digests. Rebuild it with the baseline command or set "
+            "hash_algorithm to the algorithm it was built with.",
+            config.baseline_file,
+            len(record.hash),
+            config.hash_algorithm,
+            digest_size,
+        )
+        return False
+
+    if baseline_algorithm.lower() == config.hash_algorithm.lower():
+        return True
+    logger.error(
+        "Baseline %s was built with %s but hash_algorithm is %s. "
+        "Rebuild it with the baseline command or set hash_algorithm to %s.",
+        config.baseline_file,
+        baseline_algorithm,
+        config.hash_algorithm,
+        baseline_algorithm,
+    )
+    return False
+
+
 def run_scan(config_path: Path) -> int:
     """Run a one-time scan against the baseline."""
 
     config = load_config(config_path)
     logger = setup_logging(config.log_file)
-    baseline = load_baseline(config.baseline_file)
-    current = snapshot(config, logger)
+    baseline_algorithm, baseline = load_baseline(config.baseline_file)
+    if not check_baseline(baseline_algorithm, baseline, config, logger):
+        return 1
+    current = snapshot(config, logger, baseline)
     changes = compare_baseline(baseline, current)
     report_changes(changes, logger)
     logger.info("Scan complete. %d change(s) detected.", len(changes))
@@ -72,20 +119,37 @@ def run_watch(config_path: Path, mode: str) -> int:
 
     config = load_config(config_path)
     logger = setup_logging(config.log_file)
-    baseline = load_baseline(config.baseline_file)
+    baseline_algorithm, baseline = load_baseline(config.baseline_file)
+    if not check_baseline(baseline_algorithm, baseline, config, logger):
+        return 1
 
     stop_event = Event()
+    # Ctrl+C just signals the workers; the main thread blocks on the event
+    # instead of waking up every second to check for KeyboardInterrupt.
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
 
     def polling_worker() -> None:
         while not stop_event.is_set():
-            current = snapshot(config, logger)
+            current = snapshot(config, logger, baseline, stop_event)
+            if stop_event.is_set():
+                # An interrupted scan is partial; comparing it would report
+                # every unvisited file as deleted.
+                return
             changes = compare_baseline(baseline, current)
             report_changes(changes, logger)
             stop_event.wait(config.scan_interval_seconds)
 
+    polling_thread: Optional[Thread] = None
     if mode in {"polling", "both"}:
-        thread = Thread(target=polling_worker, daemon=True)
-        thread.start()
+        polling_thread = Thread(target=polling_worker, daemon=True)
+        polling_thread.start()
+
+    def stop_polling() -> None:
+        # Join before returning so the worker never submits to the hashing
+        # pool during interpreter shutdown.
+        stop_event.set()
+        if polling_thread is not None:
+            polling_thread.join()
 
     if mode in {"realtime", "both"}:
         try:
@@ -93,33 +157,37 @@ def run_watch(config_path: Path, mode: str) -> int:
             from watchdog.observers import Observer
         except ImportError:
             logger.error("watchdog is required for realtime mode. Install with pip.")
+            stop_polling()
             return 1
 
-        class Handler(FileSystemEventHandler):
-            """Translate filesystem events into change reports."""
+        events: "SimpleQueue[Optional[str]]" = SimpleQueue()
 
-            def __init__(self) -> None:
-                super().__init__()
-                self._last_event = {}
+        def event_worker() -> None:
+            # Wait one debounce window after the first event so a burst
+            # settles, then take everything queued as one batch.
+            while True:
+                first = events.get()
+                if first is None:
+                    return
+                stop_event.wait(config.event_debounce_ms / 1000)
+
+                paths, stopping = drain_event_batch(events, first, MAX_EVENT_BATCH)
+                try:
+                    changes = build_event_changes(baseline, paths, config, logger)
+                    report_changes(changes, logger)
+                except Exception:
+                    logger.exception("Failed to process %d file event(s)", len(paths))
+                if stopping:
+                    return
 
-            def _debounced(self, path: Path) -> bool:
-                now = time.monotonic()
-                last = self._last_event.get(str(path), 0)
-                if (now - last) * 1000 < config.event_debounce_ms:
-                    return True
-                self._last_event[str(path)] = now
-                return False
+        class Handler(FileSystemEventHandler):
+            """Queue filesystem events for the batching event worker."""
 
             def on_any_event(self, event) -> None:
-                if event.is_directory:
-                    return
-
-                path = Path(event.src_path)
-                if self._debounced(path):
+                if event.is_directory or event.event_type in ACCESS_EVENT_TYPES:
                     return
 
-                changes = list(build_event_change(baseline, path, config, logger))
-                report_changes(changes, logger)
+                events.put(event.src_path)
 
             def on_moved(self, event) -> None:
                 if event.is_directory:
@@ -137,23 +205,21 @@ def run_watch(config_path: Path, mode: str) -> int:
         for root in config.paths:
             observer.schedule(handler, str(root), recursive=True)
         observer.start()
-
-        try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            stop_event.set()
-            observer.stop()
-            observer.join()
-            return 0
+        event_thread = Thread(target=event_worker, daemon=True)
+        event_thread.start()
+
+        stop_event.wait()
+        events.put(None)
+        observer.stop()
+        observer.join()
+        event_thread.join()
+        stop_polling()
+        return 0
 
     logger.info("Polling active. Press Ctrl+C to stop.")
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        stop_event.set()
-        return 0
+    stop_event.wait()
+    stop_polling()
+    return 0
 
 
 def build_parser() -> argparse.ArgumentParser:
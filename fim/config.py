@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List
 
+from .utils import ExcludeMatcher, new_hasher
+
 
 @dataclass(frozen=True)
 class Config:
@@ -14,16 +17,29 @@ class Config:
 
     paths: List[Path]
     exclude_globs: List[str]
+    exclude_matcher: ExcludeMatcher
     follow_symlinks: bool
     hash_algorithm: str
     baseline_file: Path
     log_file: Path
     scan_interval_seconds: int
     event_debounce_ms: int
+    workers: int
+
+
+def default_workers() -> int:
+    """Thread count used for hashing when the config does not set one."""
+
+    return min(32, (os.cpu_count() or 4) * 2)
 
 
 def load_config(config_path: Path) -> Config:
-    """Load config.json and normalize paths."""
+    """Load config.json and normalize paths.
+
+    ``hash_algorithm`` defaults to ``blake3``; any name accepted by
+    ``hashlib.new`` (e.g. ``sha256``) may be used instead. An unknown name,
+    or ``blake3`` without the package installed, raises ValueError.
+    """
 
     data = json.loads(config_path.read_text())
 
@@ -31,16 +47,31 @@ def load_config(config_path: Path) -> Config:
     if not paths:
         raise ValueError("Config must include at least one path.")
 
-    baseline_file = Path(data.get("baseline_file", "./baseline.json")).expanduser()
+    baseline_file = Path(data.get("baseline_file", "./baseline.msgpack.zst")).expanduser()
     log_file = Path(data.get("log_file", "./logs/fim.log")).expanduser()
+    exclude_globs = list(data.get("exclude_globs", []))
+
+    # Fail here rather than on the first file hashed inside the thread pool.
+    hash_algorithm = str(data.get("hash_algorithm", "blake3"))
+    try:
+        digest_size = new_hasher(hash_algorithm).digest_size
+    except ValueError as exc:
+        raise ValueError(f"Invalid hash_algorithm {hash_algorithm!r}: {exc}") from exc
+    if not digest_size:
+        raise ValueError(
+            f"Invalid hash_algorithm {hash_algorithm!r}: variable-length digests "
+            "are not supported."
+        )
 
     return Config(
         paths=paths,
-        exclude_globs=list(data.get("exclude_globs", [])),
+        exclude_globs=exclude_globs,
+        exclude_matcher=ExcludeMatcher(exclude_globs),
         follow_symlinks=bool(data.get("follow_symlinks", False)),
-        hash_algorithm=str(data.get("hash_algorithm", "sha256")),
+        hash_algorithm=hash_algorithm,
         baseline_file=baseline_file,
         log_file=log_file,
         scan_interval_seconds=int(data.get("scan_interval_seconds", 60)),
         event_debounce_ms=int(data.get("event_debounce_ms", 250)),
+        workers=int(data.get("workers", default_workers())),
     )
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
+import os
 import time
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Dict, Iterable, List
+from queue import Empty, SimpleQueue
+from stat import S_ISREG
+from threading import Event
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-from .baseline import BaselineRecord
+from .baseline import BaselineRecord, iter_monitored_files, hash_files
 from .config import Config
-from .utils import compute_file_hash, iter_files, should_exclude
 
 
 @dataclass(frozen=True)
@@ -18,33 +20,30 @@ class Change:
 
     change_type: str
     path: str
-    details: Dict[str, str]
+    details: Dict[str, Union[str, bytes]]
 
 
-def snapshot(config: Config, logger) -> Dict[str, BaselineRecord]:
-    """Create a fresh snapshot of current file state."""
-
-    snapshot_data: Dict[str, BaselineRecord] = {}
-
-    for root in config.paths:
-        for path in iter_files(root, config.follow_symlinks):
-            if should_exclude(path, root, config.exclude_globs):
-                continue
-
-            try:
-                file_hash = compute_file_hash(path, config.hash_algorithm)
-                stat = path.stat()
-                record = BaselineRecord(
-                    path=str(path),
-                    hash=file_hash,
-                    size=stat.st_size,
-                    mtime=stat.st_mtime,
-                )
-                snapshot_data[str(path)] = record
-            except OSError as exc:
-                logger.warning("Skipping %s: %s", path, exc)
-
-    return snapshot_data
+def snapshot(
+    config: Config,
+    logger,
+    baseline: Optional[Dict[str, BaselineRecord]] = None,
+    stop_event: Optional[Event] = None,
+) -> Dict[str, BaselineRecord]:
+    """Create a fresh snapshot of current file state.
+
+    Files whose size, mtime, ctime and inode match ``baseline`` keep their
+    baseline hash; only files with a different fingerprint are re-hashed.
+    If ``stop_event`` is set mid-scan the snapshot is incomplete and should
+    be discarded.
+    """
+
+    return hash_files(
+        iter_monitored_files(config),
+        config,
+        logger,
+        previous=baseline,
+        stop_event=stop_event,
+    )
 
 
 def compare_baseline(
@@ -53,8 +52,22 @@ def compare_baseline(
 ) -> List[Change]:
     """Compare baseline to the current snapshot and emit change objects."""
 
-    baseline_paths = set(baseline.keys())
-    current_paths = set(current.keys())
+    # One pass over each dict classifies every path without building
+    # intermediate sets; only the changed paths are sorted.
+    created_paths = sorted(path for path in current if path not in baseline)
+    deleted_paths: List[str] = []
+    modified_paths: List[str] = []
+    for path, baseline_record in baseline.items():
+        current_record = current.get(path)
+        if current_record is baseline_record:
+            # Reused by snapshot() because the fingerprint matched.
+            continue
+        if current_record is None:
+            deleted_paths.append(path)
+        elif current_record.hash != baseline_record.hash:
+            modified_paths.append(path)
+    deleted_paths.sort()
+    modified_paths.sort()
 
     changes: List[Change] = [
         Change(
@@ -62,7 +75,7 @@ def compare_baseline(
             path=created_path,
             details={"hash": current[created_path].hash},
         )
-        for created_path in sorted(current_paths - baseline_paths)
+        for created_path in created_paths
     ]
 
     changes.extend(
@@ -71,18 +84,19 @@ def compare_baseline(
             path=deleted_path,
             details={"hash": baseline[deleted_path].hash},
         )
-        for deleted_path in sorted(baseline_paths - current_paths)
+        for deleted_path in deleted_paths
     )
 
     changes.extend(
         Change(
             change_type="modified",
-            path=common_path,
-            details={"before": baseline_record.hash, "after": current_record.hash},
+            path=modified_path,
+            details={
+                "before": baseline[modified_path].hash,
+                "after": current[modified_path].hash,
+            },
         )
-        for common_path in sorted(baseline_paths & current_paths)
-        if (baseline_record := baseline[common_path]).hash
-        != (current_record := current[common_path]).hash
+        for modified_path in modified_paths
     )
 
     return changes
@@ -92,45 +106,66 @@ def polling_loop(config: Config, baseline: Dict[str, BaselineRecord], reporter,
     """Run periodic scans and report changes."""
 
     while True:
-        current = snapshot(config, logger)
+        current = snapshot(config, logger, baseline)
         changes = compare_baseline(baseline, current)
         reporter(changes)
         time.sleep(config.scan_interval_seconds)
 
 
-def build_event_change(
+def drain_event_batch(
+    events: "SimpleQueue[Optional[str]]", first: str, max_batch: int
+) -> Tuple[List[str], bool]:
+    """Collect ``first`` plus every queued event path into one batch.
+
+    Paths are deduplicated in arrival order and at most ``max_batch`` are
+    taken, so busy periods yield large batches and idle ones small batches.
+    Returns the paths and whether the ``None`` shutdown sentinel was seen.
+    """
+
+    batch = {first: None}
+    while len(batch) < max_batch:
+        try:
+            path = events.get_nowait()
+        except Empty:
+            break
+        if path is None:
+            return list(batch), True
+        batch[path] = None
+    return list(batch), False
+
+
+def build_event_changes(
     baseline: Dict[str, BaselineRecord],
-    path: Path,
+    paths: Iterable[str],
     config: Config,
     logger,
-) -> Iterable[Change]:
-    """Create a change list for a specific file path event."""
-
-    if not path.exists():
-        if str(path) in baseline:
-            return [
-                Change(
-                    change_type="deleted",
-                    path=str(path),
-                    details={"hash": baseline[str(path)].hash},
-                )
-            ]
-        return []
-
-    try:
-        file_hash = compute_file_hash(path, config.hash_algorithm)
-        baseline_record = baseline.get(str(path))
-        if baseline_record is None:
-            return [Change(change_type="created", path=str(path), details={"hash": file_hash})]
-        if baseline_record.hash != file_hash:
-            return [
-                Change(
-                    change_type="modified",
-                    path=str(path),
-                    details={"before": baseline_record.hash, "after": file_hash},
-                )
-            ]
-    except OSError as exc:
-        logger.warning("Skipping %s: %s", path, exc)
-
-    return []
+) -> List[Change]:
+    """Create a change list for a batch of file path events.
+
+    Existing files are hashed together on the thread pool; paths that no
+    longer exist are reported as deleted if they were in the baseline.
+    """
+
+    paths = list(paths)
+    files = []
+    missing = set()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            missing.add(path)
+            continue
+        except OSError as exc:
+            logger.warning("Skipping %s: %s", path, exc)
+            continue
+        if S_ISREG(stat.st_mode):
+            files.append((path, stat))
+
+    current = hash_files(files, config, logger, previous=baseline)
+    # Unreadable files are logged and left out rather than reported deleted.
+    event_baseline = {
+        path: baseline[path]
+        for path in paths
+        if path in baseline and (path in current or path in missing)
+    }
+    return compare_baseline(event_baseline, current)
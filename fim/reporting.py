@@ -8,17 +8,24 @@ from .monitor import Change
 
 
 def format_change(change: Change) -> str:
-    """Create a human-readable change description."""
+    """Create a human-readable change description.
+
+    Digests are kept as raw bytes everywhere else and only hex-encoded here,
+    once per reported change.
+    """
 
     if change.change_type == "modified":
-        return f"MODIFIED {change.path} before={change.details['before']} after={change.details['after']}"
+        return (
+            f"MODIFIED {change.path} before={change.details['before'].hex()} "
+            f"after={change.details['after'].hex()}"
+        )
     if change.change_type == "created":
-        return f"CREATED {change.path} hash={change.details['hash']}"
+        return f"CREATED {change.path} hash={change.details['hash'].hex()}"
     if change.change_type == "deleted":
-        return f"DELETED {change.path} hash={change.details['hash']}"
+        return f"DELETED {change.path} hash={change.details['hash'].hex()}"
     if change.change_type == "moved":
         return (
-            f"MOVED {change.details['from']} -> {change.details['to']} hash={change.details.get('hash', '')}"
+            f"MOVED {change.details['from']} -> {change.details['to']} hash={change.details.get('hash', b'').hex()}"
         )
     return f"{change.change_type.upper()} {change.path}"
 
@@ -2,38 +2,275 @@
 
 from __future__ import annotations
 
+import fnmatch
 import hashlib
+import mmap
+import os
+import re
+import threading
 from pathlib import Path
-from typing import Iterable, Iterator
+from stat import S_ISREG
+from typing import Iterable, Iterator, Optional, Pattern, Tuple, Union
 
 
-def compute_file_hash(path: Path, algorithm: str) -> str:
-    """Compute a hex digest for a file using the chosen algorithm."""
+CHUNK_SIZE = 1024 * 1024
+MMAP_THRESHOLD = 1024 * 1024
 
-    hasher = hashlib.new(algorithm)
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            hasher.update(chunk)
-    return hasher.hexdigest()
 
+def new_hasher(algorithm: str):
+    """Create a hash object for the algorithm name.
 
-def should_exclude(path: Path, root: Path, exclude_globs: Iterable[str]) -> bool:
-    """Return True if path matches any exclude glob (absolute or relative)."""
+    ``blake3`` uses the optional ``blake3`` package (SIMD + multithreaded);
+    every other name is passed to ``hashlib.new``.
+    """
 
-    relative = path.relative_to(root)
-    for pattern in exclude_globs:
-        if path.match(pattern) or relative.match(pattern):
-            return True
-    return False
+    if algorithm == "blake3":
+        try:
+            from blake3 import blake3
+        except ImportError as exc:
+            raise ValueError(
+                "blake3 is required for the blake3 hash algorithm. Install with pip."
+            ) from exc
+        return blake3(max_threads=blake3.AUTO)
+    return hashlib.new(algorithm)
 
 
-def iter_files(root: Path, follow_symlinks: bool) -> Iterator[Path]:
-    """Yield files under a root path, supporting single files and directories."""
+OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+NOATIME_FLAG = getattr(os, "O_NOATIME", 0)
 
-    if root.is_file():
-        yield root
+_thread_state = threading.local()
+
+
+def _read_buffer() -> memoryview:
+    """Return this thread's reusable ``CHUNK_SIZE`` read buffer."""
+
+    buffer = getattr(_thread_state, "read_buffer", None)
+    if buffer is None:
+        buffer = _thread_state.read_buffer = memoryview(bytearray(CHUNK_SIZE))
+    return buffer
+
+
+def _open_for_hash(path: Union[str, Path]) -> Tuple[int, os.stat_result]:
+    """Open a file read-only and fstat it through the same descriptor.
+
+    ``O_NOATIME`` (Linux) keeps scans from dirtying inodes, but is only
+    permitted for the file owner, so other files are reopened without it.
+    """
+
+    try:
+        fd = os.open(path, OPEN_FLAGS | NOATIME_FLAG)
+    except PermissionError:
+        if not NOATIME_FLAG:
+            raise
+        fd = os.open(path, OPEN_FLAGS)
+    try:
+        stat = os.fstat(fd)
+    except OSError:
+        os.close(fd)
+        raise
+    return fd, stat
+
+
+def compute_file_hash(
+    path: Union[str, Path], algorithm: str
+) -> Tuple[bytes, os.stat_result]:
+    """Compute the raw digest of a file and the stat of the file hashed.
+
+    The stat comes from ``fstat`` on the descriptor used for hashing, so it
+    describes exactly the file that was read. Files of at least
+    ``MMAP_THRESHOLD`` bytes are memory-mapped and fed to the hasher in one
+    call. Smaller files, and files that cannot be mapped, are read with
+    ``readinto`` into a reusable per-thread buffer, so no new ``bytes`` object
+    is allocated per chunk.
+    """
+
+    hasher = new_hasher(algorithm)
+    fd, stat = _open_for_hash(path)
+    with os.fdopen(fd, "rb", buffering=0) as handle:
+        if stat.st_size >= MMAP_THRESHOLD:
+            try:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                    advice = getattr(mmap, "MADV_SEQUENTIAL", None)
+                    if advice is not None:
+                        mapped.madvise(advice)
+                    hasher.update(mapped)
+                return hasher.digest(), stat
+            except (ValueError, OSError):
+                hasher = new_hasher(algorithm)
+
+        buffer = _read_buffer()
+        while count := handle.readinto(buffer):
+            hasher.update(buffer[:count])
+    return hasher.digest(), stat
+
+
+def _class_to_regex(body: str) -> str:
+    """Translate the inside of a ``[...]`` glob class like ``fnmatch`` does.
+
+    Reversed ranges such as ``z-a`` are dropped instead of raising, and
+    characters ``re`` treats as set operations are escaped.
+    """
+
+    negate = body.startswith("!")
+    if negate:
+        body = body[1:]
+    if "-" in body:
+        # A leading "-" is literal, so range searches start at index 1.
+        chunks = []
+        start, index = 0, 1
+        while (index := body.find("-", index)) >= 0:
+            chunks.append(body[start:index])
+            start, index = index + 1, index + 3
+        if body[start:]:
+            chunks.append(body[start:])
+        else:
+            chunks[-1] += "-"
+        for index in range(len(chunks) - 1, 0, -1):
+            if chunks[index - 1][-1] > chunks[index][0]:
+                chunks[index - 1] = chunks[index - 1][:-1] + chunks[index][1:]
+                del chunks[index]
+        body = "-".join(
+            chunk.replace("\\", "\\\\").replace("-", "\\-") for chunk in chunks
+        )
+    else:
+        body = body.replace("\\", "\\\\")
+    body = re.sub(r"([&~|\[])", r"\\\1", body)
+
+    if not body:
+        # "[!]"-style empty negation matches any character; empty never does.
+        return "[^/]" if negate else "(?!)"
+    if negate:
+        return f"(?!/)[^{body}]"
+    if body.startswith("^"):
+        body = "\\" + body
+    return f"(?!/)[{body}]"
+
+
+def _segment_to_regex(segment: str) -> str:
+    """Translate one glob path segment; wildcards never match ``/``."""
+
+    parts = []
+    index, length = 0, len(segment)
+    while index < length:
+        char = segment[index]
+        index += 1
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = index
+            if end < length and segment[end] == "!":
+                end += 1
+            if end < length and segment[end] == "]":
+                end += 1
+            while end < length and segment[end] != "]":
+                end += 1
+            if end >= length:
+                parts.append("\\[")
+                continue
+            parts.append(_class_to_regex(segment[index:end]))
+            index = end + 1
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts)
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Translate a glob into a regex with ``PurePath.match`` semantics.
+
+    The glob is matched segment by segment from the right: ``logs/*`` matches
+    ``/x/logs/a`` but not ``/x/logs/a/b``, and ``*`` (or ``**``) never crosses
+    a ``/``. A glob starting with ``/`` must match the whole path.
+    """
+
+    segments = [part for part in pattern.split("/") if part not in ("", ".")]
+    if not segments:
+        raise ValueError(f"Empty exclude glob: {pattern!r}")
+    body = "/".join(_segment_to_regex(segment) for segment in segments)
+    if pattern.startswith("/"):
+        # POSIX keeps exactly two leading slashes as a distinct root.
+        double = pattern.startswith("//") and not pattern.startswith("///")
+        root = "//" if double else "/"
+        return f"^{root}{body}\\Z"
+    regex = f"(?:^|/){body}\\Z"
+    if fnmatch.fnmatchcase("/", segments[0]):
+        # PurePath.match also lets the first segment match the root itself.
+        rest = "/".join(_segment_to_regex(segment) for segment in segments[1:])
+        regex = f"{regex}|^/{rest}\\Z"
+    return regex
+
+
+class ExcludeMatcher:
+    """Match a path against every exclude glob with one compiled search.
+
+    All globs are joined into one compiled ``re`` alternation, so each path
+    costs a single C-level search instead of a Python loop over the globs;
+    the search still tries the alternatives in turn.
+    """
+
+    def __init__(self, exclude_globs: Iterable[str]) -> None:
+        self._globs = list(exclude_globs)
+        self._regex: Optional[Pattern[str]] = None
+        if self._globs:
+            self._regex = re.compile(
+                "|".join(f"(?:{glob_to_regex(pattern)})" for pattern in self._globs)
+            )
+
+    def match(self, text: str) -> bool:
+        """Return True if text matches any of the globs."""
+
+        return self._regex is not None and self._regex.search(text) is not None
+
+
+def should_exclude(path: str, matcher: ExcludeMatcher) -> bool:
+    """Return True if path matches any exclude glob.
+
+    Relative globs match from the right, so matching the absolute path also
+    covers the path relative to its monitored root.
+    """
+
+    return matcher.match(path)
+
+
+def iter_files(
+    root: Path, follow_symlinks: bool, with_stat: bool = True
+) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+    """Yield ``(path, stat)`` for files under a root path.
+
+    Supports single files and directories. Directories are walked with
+    ``os.scandir`` so type checks use the cached ``DirEntry`` information.
+    ``DirEntry.stat()`` costs a syscall on Linux, so with ``with_stat=False``
+    entries are not stat'ed and ``None`` is yielded in place of the stat.
+    As with ``Path.rglob``, symlinked directories are not descended into and
+    unreadable directories are skipped.
+    """
+
+    root_str = os.fspath(root)
+    try:
+        root_stat = os.stat(root_str)
+    except OSError:
+        return
+    if S_ISREG(root_stat.st_mode):
+        yield root_str, root_stat
         return
 
-    for path in root.rglob("*"):
-        if path.is_file() and (follow_symlinks or not path.is_symlink()):
-            yield path
+    stack = [root_str]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and (follow_symlinks or not entry.is_symlink()):
+                    if not with_stat:
+                        yield entry.path, None
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    yield entry.path, stat
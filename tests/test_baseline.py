@@ -0,0 +1,129 @@
+"""Unit tests for baseline persistence."""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from fim.baseline import BaselineRecord, load_baseline, save_baseline
+from fim.cli import check_baseline
+from fim.config import Config
+from fim.utils import ExcludeMatcher
+
+HAS_BINARY_CODECS = all(
+    importlib.util.find_spec(name) is not None for name in ("msgpack", "zstandard")
+)
+
+
+class BaselinePersistenceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.records = {
+            "/path/a.txt": BaselineRecord(
+                path="/path/a.txt",
+                hash=bytes.fromhex("abc123"),
+                size=3,
+                mtime=1.5,
+                mtime_ns=1_500_000_000,
+                inode=42,
+                ctime_ns=1_600_000_000,
+            ),
+        }
+        # Non-UTF-8 filenames arrive from os.scandir as surrogate escapes.
+        undecodable = os.fsdecode(b"/path/bad\xff.txt")
+        self.records[undecodable] = BaselineRecord(
+            path=undecodable,
+            hash=bytes.fromhex("def456"),
+            size=4,
+            mtime=2.5,
+        )
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_json_round_trip(self) -> None:
+        destination = self.root / "baseline.json"
+        save_baseline(self.records, destination, "blake3")
+        self.assertEqual(load_baseline(destination), ("blake3", self.records))
+
+    def test_legacy_json_without_algorithm_has_no_algorithm(self) -> None:
+        destination = self.root / "baseline.json"
+        digest = hashlib.sha512(b"a").digest()
+        destination.write_text(
+            json.dumps(
+                {
+                    "/path/a.txt": {
+                        "path": "/path/a.txt",
+                        "hash": digest.hex(),
+                        "size": 1,
+                        "mtime": 1.5,
+                    }
+                }
+            )
+        )
+
+        hash_algorithm, records = load_baseline(destination)
+
+        self.assertIsNone(hash_algorithm)
+        self.assertEqual(records["/path/a.txt"].hash, digest)
+
+    @unittest.skipUnless(HAS_BINARY_CODECS, "msgpack and zstandard not installed")
+    def test_binary_round_trip(self) -> None:
+        destination = self.root / "baseline.msgpack.zst"
+        save_baseline(self.records, destination, "blake3")
+        self.assertEqual(load_baseline(destination), ("blake3", self.records))
+
+
+class CheckBaselineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger("fim.tests")
+        # A legacy baseline built with sha512, before algorithms were recorded.
+        self.legacy = {
+            "/path/a.txt": BaselineRecord(
+                path="/path/a.txt",
+                hash=hashlib.sha512(b"a").digest(),
+                size=1,
+                mtime=1.5,
+            )
+        }
+
+    def make_config(self, hash_algorithm: str) -> Config:
+        return Config(
+            paths=[Path("/path")],
+            exclude_globs=[],
+            exclude_matcher=ExcludeMatcher([]),
+            follow_symlinks=False,
+            hash_algorithm=hash_algorithm,
+            baseline_file=Path("/path/baseline.json"),
+            log_file=Path("/path/fim.log"),
+            scan_interval_seconds=60,
+            event_debounce_ms=250,
+            workers=2,
+        )
+
+    def test_legacy_baseline_accepts_matching_digest_size(self) -> None:
+        config = self.make_config("sha512")
+        self.assertTrue(check_baseline(None, self.legacy, config, self.logger))
+
+    def test_legacy_baseline_rejects_other_digest_size(self) -> None:
+        config = self.make_config("sha256")
+        with self.assertLogs(self.logger, level="ERROR") as logs:
+            self.assertFalse(check_baseline(None, self.legacy, config, self.logger))
+        self.assertIn("64-byte digests", logs.output[0])
+
+    def test_recorded_algorithm_is_compared_by_name(self) -> None:
+        config = self.make_config("SHA512")
+        self.assertTrue(check_baseline("sha512", self.legacy, config, self.logger))
+        with self.assertLogs(self.logger, level="ERROR"):
+            self.assertFalse(
+                check_baseline("blake3", self.legacy, config, self.logger)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
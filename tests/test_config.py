@@ -0,0 +1,46 @@
+"""Unit tests for configuration loading."""
+
+import importlib.util
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from fim.config import load_config
+
+HAS_BLAKE3 = importlib.util.find_spec("blake3") is not None
+
+
+class LoadConfigTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def write_config(self, **overrides) -> Path:
+        config_path = self.root / "config.json"
+        config_path.write_text(json.dumps({"paths": [str(self.root)], **overrides}))
+        return config_path
+
+    def test_accepts_hashlib_algorithm(self) -> None:
+        config = load_config(self.write_config(hash_algorithm="sha512"))
+        self.assertEqual(config.hash_algorithm, "sha512")
+
+    def test_rejects_unknown_algorithm(self) -> None:
+        with self.assertRaisesRegex(ValueError, "Invalid hash_algorithm 'sha999'"):
+            load_config(self.write_config(hash_algorithm="sha999"))
+
+    def test_rejects_variable_length_algorithm(self) -> None:
+        with self.assertRaisesRegex(ValueError, "variable-length"):
+            load_config(self.write_config(hash_algorithm="shake_128"))
+
+    @unittest.skipIf(HAS_BLAKE3, "blake3 is installed")
+    def test_default_blake3_without_package_is_rejected(self) -> None:
+        with self.assertRaisesRegex(ValueError, "blake3 is required"):
+            load_config(self.write_config())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,39 @@
 """Unit tests for monitor change detection."""
 
+import logging
+import os
+import tempfile
+import time
 import unittest
+from dataclasses import replace
+from pathlib import Path
+from queue import SimpleQueue
+from threading import Event
 
-from fim.baseline import BaselineRecord
-from fim.monitor import compare_baseline
+from fim.baseline import BaselineRecord, build_baseline
+from fim.config import Config
+from fim.monitor import (
+    build_event_changes,
+    compare_baseline,
+    drain_event_batch,
+    snapshot,
+)
+from fim.utils import ExcludeMatcher
+
+
+def make_config(root: Path) -> Config:
+    return Config(
+        paths=[root],
+        exclude_globs=[],
+        exclude_matcher=ExcludeMatcher([]),
+        follow_symlinks=False,
+        hash_algorithm="sha256",
+        baseline_file=root / "baseline.json",
+        log_file=root / "fim.log",
+        scan_interval_seconds=60,
+        event_debounce_ms=250,
+        workers=2,
+    )
 
 
 class CompareBaselineTests(unittest.TestCase):
@@ -50,5 +80,109 @@ class CompareBaselineTests(unittest.TestCase):
         )
 
 
+class SnapshotTests(unittest.TestCase):
+    def test_snapshot_reuses_hash_for_unchanged_files(self) -> None:
+        logger = logging.getLogger("fim.tests")
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "same.txt").write_text("same")
+            (root / "edited.txt").write_text("before")
+            config = make_config(root)
+
+            baseline = {
+                path: replace(record, hash=b"cached")
+                for path, record in build_baseline(config, logger).items()
+            }
+            (root / "edited.txt").write_text("after!")
+
+            current = snapshot(config, logger, baseline)
+
+        self.assertEqual(current[str(root / "same.txt")].hash, b"cached")
+        self.assertNotEqual(current[str(root / "edited.txt")].hash, b"cached")
+
+    def test_snapshot_detects_tampering_with_restored_mtime(self) -> None:
+        logger = logging.getLogger("fim.tests")
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            target = root / "passwd"
+            target.write_text("root:x:0:0")
+            config = make_config(root)
+            baseline = build_baseline(config, logger)
+            original = os.stat(target)
+
+            # Let the coarse kernel clock advance so ctime visibly changes.
+            time.sleep(0.05)
+            target.write_text("evil:x:0:0")
+            os.utime(target, ns=(original.st_atime_ns, original.st_mtime_ns))
+
+            changes = compare_baseline(baseline, snapshot(config, logger, baseline))
+
+        self.assertEqual(
+            [(change.change_type, change.path) for change in changes],
+            [("modified", str(target))],
+        )
+
+
+    def test_snapshot_stops_submitting_once_stop_event_is_set(self) -> None:
+        logger = logging.getLogger("fim.tests")
+        stop_event = Event()
+        stop_event.set()
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for index in range(20):
+                (root / f"file{index}.txt").write_text(str(index))
+
+            current = snapshot(make_config(root), logger, stop_event=stop_event)
+
+        self.assertEqual(current, {})
+
+
+class BuildEventChangesTests(unittest.TestCase):
+    def test_batch_reports_created_deleted_modified(self) -> None:
+        logger = logging.getLogger("fim.tests")
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for name in ("deleted.txt", "modified.txt", "same.txt"):
+                (root / name).write_text(name)
+            config = make_config(root)
+            baseline = build_baseline(config, logger)
+
+            (root / "deleted.txt").unlink()
+            (root / "modified.txt").write_text("changed contents")
+            (root / "created.txt").write_text("new")
+
+            names = ("created.txt", "deleted.txt", "modified.txt", "same.txt")
+            paths = [str(root / name) for name in names]
+            changes = build_event_changes(baseline, paths, config, logger)
+
+        summary = [(change.change_type, Path(change.path).name) for change in changes]
+        self.assertEqual(
+            summary,
+            [
+                ("created", "created.txt"),
+                ("deleted", "deleted.txt"),
+                ("modified", "modified.txt"),
+            ],
+        )
+
+
+class DrainEventBatchTests(unittest.TestCase):
+    def test_deduplicates_and_stops_at_sentinel(self) -> None:
+        events = SimpleQueue()
+        for path in ("/a", "/b", "/a", None, "/c"):
+            events.put(path)
+
+        self.assertEqual(drain_event_batch(events, "/b", 10), (["/b", "/a"], True))
+        self.assertEqual(events.get_nowait(), "/c")
+
+    def test_respects_max_batch(self) -> None:
+        events = SimpleQueue()
+        for path in ("/b", "/c", "/d"):
+            events.put(path)
+
+        self.assertEqual(drain_event_batch(events, "/a", 2), (["/a", "/b"], False))
+        self.assertEqual(drain_event_batch(events, "/c", 10), (["/c", "/d"], False))
+
+
 if __name__ == "__main__":
     unittest.main()
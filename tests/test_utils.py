@@ -0,0 +1,92 @@
+"""Unit tests for shared helpers."""
+
+import hashlib
+import tempfile
+import unittest
+import warnings
+from pathlib import Path, PurePosixPath
+
+from fim.utils import (
+    MMAP_THRESHOLD,
+    ExcludeMatcher,
+    compute_file_hash,
+    should_exclude,
+)
+
+
+class ComputeFileHashTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _assert_matches_hashlib(self, data: bytes) -> None:
+        path = self.root / "file.bin"
+        path.write_bytes(data)
+        digest, stat = compute_file_hash(path, "sha256")
+        self.assertEqual(digest, hashlib.sha256(data).digest())
+        self.assertEqual(stat.st_size, len(data))
+
+    def test_small_and_empty_files(self) -> None:
+        self._assert_matches_hashlib(b"")
+        self._assert_matches_hashlib(b"hello world")
+
+    def test_large_file_uses_mmap_path(self) -> None:
+        self._assert_matches_hashlib(b"x" * (MMAP_THRESHOLD + 123))
+
+
+class ShouldExcludeTests(unittest.TestCase):
+    def test_matches_absolute_and_relative_paths(self) -> None:
+        matcher = ExcludeMatcher(["**/*.tmp", "cache/*", "[!a]?.log"])
+
+        self.assertTrue(should_exclude("/data/sub/a.tmp", matcher))
+        self.assertTrue(should_exclude("/data/cache/a.txt", matcher))
+        self.assertTrue(should_exclude("/data/b1.log", matcher))
+        self.assertFalse(should_exclude("/data/a1.log", matcher))
+        self.assertFalse(should_exclude("/data/sub/a.txt", matcher))
+        self.assertFalse(should_exclude("/data/a.txt", ExcludeMatcher([])))
+
+    def test_matches_like_pure_path_match(self) -> None:
+        cases = [
+            ("tmp*", "/data/tmpdir/secret.conf", False),
+            ("tmp*", "/data/tmpfile", True),
+            ("sub/*.pyc", "/data/sub/deep/a.pyc", False),
+            ("sub/*.pyc", "/data/sub/a.pyc", True),
+            ("logs/*", "/data/x/logs/a", True),
+            ("logs/*", "/data/logs/a/b", False),
+            (".git/*", "/data/src/.git/config", True),
+            ("**/*.tmp", "/data/a.tmp", True),
+            ("*.log", "/data/deep/dir/app.log", True),
+            ("/data/*.txt", "/data/a.txt", True),
+            ("/data/*.txt", "/data/sub/a.txt", False),
+            ("[!a]?.log", "/data/b1.log", True),
+            ("[.-0]x", "/data/a/x", False),
+            # Reversed ranges are empty, as in fnmatch, rather than re errors.
+            ("[z-a].log", "/data/a.log", False),
+            ("[z-a].log", "/data/-.log", False),
+            ("[b-*]", "/data/b", False),
+            ("[!z-a]", "/data/q", True),
+            ("[a-cz-b]", "/data/b", True),
+            # Set-operation lookalikes stay literal class members.
+            ("[a&&b]", "/data/&", True),
+            ("[a--b]", "/data/-", False),
+            ("[*--]", "/data/,", True),
+            ("[a||b]", "/data/|", True),
+            ("[a~~b]", "/data/~", True),
+            ("[a[b]", "/data/[", True),
+            ("[[:alpha:]]", "/data/:]", True),
+            ("//*", "/data", False),
+        ]
+        for pattern, path, expected in cases:
+            with self.subTest(pattern=pattern, path=path):
+                self.assertEqual(PurePosixPath(path).match(pattern), expected)
+                with warnings.catch_warnings():
+                    warnings.simplefilter("error")
+                    matcher = ExcludeMatcher([pattern])
+                self.assertEqual(should_exclude(path, matcher), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()